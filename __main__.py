@@ -1,5 +1,5 @@
 # /// script
-# dependencies = ["fastmcp", "rich", "httpx", "sse-starlette", "starlette", "uvicorn"]
+# dependencies = ["fastmcp", "rich", "httpx[http2]", "orjson", "sse-starlette", "starlette", "uvicorn", "google-re2"]
 # ///
 
 import sys
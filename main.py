@@ -1,19 +1,31 @@
 #!/usr/bin/env python3
 # /// script
-# dependencies = ["fastmcp", "rich", "httpx", "sse-starlette", "starlette", "uvicorn"]
+# dependencies = ["fastmcp", "rich", "httpx[http2]", "orjson", "sse-starlette", "starlette", "uvicorn", "google-re2"]
 # ///
 
 from mcp.server.fastmcp import FastMCP
 import subprocess
 import re
-from urllib.parse import urlparse
+import shlex
+from urllib.parse import urlparse, quote
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from queue import SimpleQueue
 import os
 import argparse
 import asyncio
-import json
+import functools
+import shutil
+from dataclasses import dataclass, field
+from typing import Optional
 import logging
+import logging.handlers
+import atexit
 import signal
+import socket
 import sys
+import weakref
+import httpx
+import orjson
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
@@ -27,12 +39,233 @@ try:
 except ImportError:
     SSE_AVAILABLE = False
 
+# Optional libuv-based event loop for the SSE server (not available on Windows)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = sys.platform != "win32"
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Optional linear-time regex engine for the backtracking-prone instruction patterns
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
 mcp = FastMCP("curl-mcp")
 console = Console()
 logger = logging.getLogger(__name__)
 
 # Global server instance for signal handling
 server_instance = None
+# Background log writer, stopped (and flushed) on shutdown
+log_listener = None
+
+# Shared HTTP client so connection pooling and keep-alive are reused across tool calls
+_HTTPX_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+# curl keeps no cookies between invocations, and the clients are shared by every caller (all SSE
+# sessions included): give them a jar whose policy accepts no domain, so it never stores a cookie
+_NO_COOKIES = CookieJar(policy=DefaultCookiePolicy(allowed_domains=()))
+_HTTPX_CLIENT = httpx.AsyncClient(http2=True, limits=_HTTPX_LIMITS, cookies=_NO_COOKIES)
+# Shared clients keyed by certificate verification (-k), which httpx only accepts per client;
+# proxies (-x) come from user input, so they get a one-off client instead of a cached one
+_HTTPX_CLIENTS = {True: _HTTPX_CLIENT}
+# Response bodies are streamed in chunks; output returned to the client is capped, since it
+# is copied again into the tool result text (use -o for anything larger)
+STREAM_CHUNK_SIZE = 64 * 1024
+MAX_OUTPUT_BYTES = 256 * 1024
+
+# Instructions longer than this are parsed without caching, to bound cache memory, and in a worker
+# thread, since patterns that run on backtracking re (non-ASCII text, or re2 missing) can be slow on them
+PARSE_CACHE_MAX_INSTRUCTION = 4096
+
+
+class LinearPattern:
+    """
+    A pattern compiled for both re2 and re.
+    re2 folds case and classifies \\b, \\w and \\s by ASCII rules, so it only agrees with re on
+    ASCII text; non-ASCII text (accented Spanish, long s, dotless i) goes to the re compile.
+    """
+    __slots__ = ("linear", "fallback")
+
+    def __init__(self, linear, fallback):
+        self.linear = linear
+        self.fallback = fallback
+
+    def search(self, text: str):
+        return (self.linear if text.isascii() else self.fallback).search(text)
+
+    def match(self, text: str, *args):
+        return (self.linear if text.isascii() else self.fallback).match(text, *args)
+
+    def finditer(self, text: str):
+        return (self.linear if text.isascii() else self.fallback).finditer(text)
+
+
+# Python's \s also matches \v and the \x1c-\x1f separators on ASCII text; re2's does not
+_RE2_SPACE = r'[\t\n\x0b\x0c\r \x1c-\x1f]'
+
+
+def compile_linear(pattern: str, flags: int = 0):
+    """
+    Helper Function for Pattern Compilation.
+    Compiles with re2 as well when it is installed, so matching stays linear-time on adversarial
+    instructions; falls back to re alone if re2 is missing or rejects the pattern.
+    Only re.IGNORECASE and re.DOTALL are carried over to re2.
+    """
+    compiled = re.compile(pattern, flags)
+    # \s inside a character class can't be widened by substitution; leave those patterns to re
+    if RE2_AVAILABLE and not flags & ~(re.IGNORECASE | re.DOTALL) and not re.search(r'\[[^\]]*\\s', pattern):
+        inline_flags = ("i" if flags & re.IGNORECASE else "") + ("s" if flags & re.DOTALL else "")
+        try:
+            linear = re2.compile((f"(?{inline_flags})" if inline_flags else "") + pattern.replace(r'\s', _RE2_SPACE))
+        except re2.error:
+            return compiled
+        return LinearPattern(linear, compiled)
+    return compiled
+
+
+# Instruction parsing patterns, compiled once at import instead of on every parse.
+# Patterns compiled without re.IGNORECASE are matched against the lowercased instruction.
+_RE_RAW = re.compile(r'\b(raw|crudo|consola|terminal)\b')
+
+# URL patterns ordered by priority: explicit URLs, then keywords, then generic domain-like patterns
+_RE_URL_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'https?://[^\s"\'<>]+',                      # Full URL (highest priority)
+    r'(?:url|uri|site|sitio|endpoint|address)\s*[:=]?\s*\'?("?)(https?://[^\s"\'<>]+)\1\'?',  # url: https://...
+    # url: example.com/path
+    r'(?:url|uri|site|sitio|endpoint|address)\s*[:=]?\s*\'?("?)([a-zA-Z0-9.-]+\.[a-zA-Z]{2,}[^\s"\'<>]*)\1\'?',
+    r'\bto\s+([a-zA-Z0-9.-]+\.[a-zA-Z]{2,}[^\s"\'<>]*)\b',  # request to example.com
+    r'\b(?:on|at|for)\s+([a-zA-Z0-9.-]+\.[a-zA-Z]{2,}[^\s"\'<>]*)\b',  # get headers for example.com
+    r'\b([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b'          # Bare domain (lowest priority)
+)]
+# The first two patterns need a literal scheme, and any text the second matches also matches
+# the first, so a miss on the full-URL pattern leaves only the domain patterns in play
+_RE_FULL_URL = _RE_URL_PATTERNS[0]
+_RE_DOMAIN_URL_PATTERNS = _RE_URL_PATTERNS[2:]
+# Schemes recognised without a regex; the prefix is folded like IGNORECASE would before comparing
+_URL_SCHEMES = ('http://', 'https://')
+_URL_STRIP_CHARS = '.,:;"\''
+
+# Boolean classifiers, fused into one alternation so a single finditer pass
+# reports every keyword class present (dispatch on m.lastgroup). Only patterns
+# whose matches cannot overlap each other belong here.
+# Use \b for word boundaries to avoid matching 'posting' as POST
+_KEYWORD_PATTERNS = (
+    ("head", r'\b(?:head|headers?|cabeceras?|encabezados?)\b'),
+    ("head_qualifier", r'\b(?:only|just|solo|solamente|show|mostrar|obtener|get)\b'),
+    ("post", r'\bpost\b|\benví[ao](?:r)?\b|\bsubmit\b|\bsend\b'),
+    ("put", r'\bput\b|\bactualiz[ao](?:r)?\b|\bupdate\b'),
+    ("delete", r'\bdelete\b|\belimin[ao](?:r)?\b|\bremove\b'),
+    ("options", r'\boptions\b'),
+    ("patch", r'\bpatch\b|\bparch[ea](?:r)?\b'),
+    ("save", r'\b(?:save|guardar|salvar|output|salida)\b'),
+    ("verbose", r'\b(?:verbose|detallado|details|detalles)\b'),
+    ("silent", r'\b(?:silent|silencioso|quiet|callado)\b'),
+    # A no_follow match also contains a follow match; parse_instruction accounts for that
+    ("no_follow", r'\b(?:no|not|sin)\s+(?:follow|seguir)\s+redirects?'),
+    ("follow", r'\b(?:follow|seguir)\s+redirects?'),
+    ("insecure", r'(?:insecure|unsafe|skip|salta(?:r)?|ignore|ignora(?:r)?)\s+(?:ssl|cert|verification|verificaci[oó]n)'),
+)
+_RE_KEYWORDS = compile_linear("|".join(f"(?P<{name}>{pattern})" for name, pattern in _KEYWORD_PATTERNS))
+# Checked in priority order; HEAD (-I) is handled separately
+_METHOD_KEYWORDS = (("post", "POST"), ("put", "PUT"), ("delete", "DELETE"), ("options", "OPTIONS"), ("patch", "PATCH"))
+
+
+_RE_FORM_FILE = re.compile(
+    r'(?:form|formulario)\s+(?:field|campo)\s+(["\']?)([^"\']+)\1\s+(?:with|con)\s+(?:file|archivo)\s+(["\']?)([^"\']+)\3', re.IGNORECASE)
+_RE_FILE_DATA = re.compile(
+    r'(?:data|datos)\s+(?:from|desde)\s+(?:file|archivo)\s+(["\']?)([^"\']+)\1', re.IGNORECASE)
+_RE_URLENCODE = re.compile(
+    r'(?:urlencoded|encoded)\s+(?:data|datos)\s+(["\']?)(.+?)\1(?:\s|$)', re.IGNORECASE)
+# Look for explicit data keywords followed by quoted string or JSON structure
+# Each quote style gets its own group instead of a (["'])...\1 backreference, so re2 accepts it
+_RE_INLINE_DATA = compile_linear(
+    r'(?:data|datos|body|cuerpo|payload|json)\s*[:=]?\s*'
+    r'(?:"(.*?)"|\'(.*?)\'|(\{.*?\})|(\[.*?\]))',  # Quoted string OR {json} OR [json_array]
+    re.IGNORECASE | re.DOTALL  # DOTALL for multiline JSON
+)
+_RE_JSON_WORD = re.compile(r'\bjson\b', re.IGNORECASE)
+
+# Header: Value (non-greedy value)
+_RE_HEADER = re.compile(r'(?:header|cabecera|encabezado)\s*[:=]?\s*(["\']?)([\w-]+:\s*.*?)\1(?=[\s,\.]|$)', re.IGNORECASE)
+_RE_AUTH_HEADER = re.compile(r'(?:auth(?:orization)?|autorizaci[oó]n)\s*[:=]?\s*(["\']?)(\w+\s+[^"\']+?)\1', re.IGNORECASE)
+_RE_BEARER = re.compile(r'(?:bearer|token)\s*[:=]?\s*(["\']?)([^"\']+?)\1', re.IGNORECASE)
+
+_RE_UA_PRESET = re.compile(
+    r'(?:user[-\s]*agent|agente\s*de\s*usuario|as|como)\s+["\']?(iphone|android|chrome|firefox|safari|bot|curl)[\'"]?')
+_RE_UA_CUSTOM = re.compile(r'(?:user[-\s]*agent|agente\s*de\s*usuario)\s*[:=]?\s*(["\'])(.+?)\1', re.IGNORECASE)
+
+# Absolute path to curl, resolved once: subprocess only takes its posix_spawn fast path
+# when the executable has a directory component (and no preexec_fn/cwd/new session is used)
+_CURL_PATH = shutil.which("curl") or "curl"
+
+# Resolve the installed curl version once instead of forking `curl --version` on every parse
+try:
+    _CURL_USER_AGENT = f"curl/{subprocess.check_output([_CURL_PATH, '--version']).decode().split()[1]}"
+except (OSError, subprocess.CalledProcessError, IndexError):
+    _CURL_USER_AGENT = "curl/unknown"
+
+_USER_AGENTS = {
+    "iphone": "Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Mobile/15E148 Safari/604.1",
+    "android": "Mozilla/5.0 (Linux; Android 10; SM-A205U) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Mobile Safari/537.36",
+    "chrome": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Safari/537.36",
+    "firefox": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/112.0",
+    "safari": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.4 Safari/605.1.15",
+    "bot": "Googlebot/2.1 (+http://www.google.com/bot.html)",
+    "curl": _CURL_USER_AGENT
+}
+
+_RE_SAVE_AS = compile_linear(
+    r'(?:save|guardar|salvar|write|escribir)\s+(?:to|en|as|como)\s+(?:file|archivo)?\s*["\']?([^"\']+)["\']?', re.IGNORECASE)
+
+_RE_INCLUDE_HEADERS = re.compile(r'\b(include|incluir|show|mostrar|with)\s+headers\b')
+
+# Pattern 1: user X and password Y
+_RE_USER_PASS = compile_linear(
+    r'(?:user|usuario)\s+["\']?([^"\']+)["\']?\s+(?:and|y|with|con)\s+(?:password|pass|contraseña)\s+["\']?([^"\']+)["\']?', re.IGNORECASE)
+# Pattern 2: auth user:pass
+_RE_AUTH_PAIR = compile_linear(
+    r'(?:auth(?:entication)?|autenticaci[oó]n)\s*[:=]?\s*["\']?([^:"]+):([^"\']+)["\']?', re.IGNORECASE)
+
+_RE_TIMEOUT = compile_linear(
+    r'(?:timeout|wait|espera|limit(?:e)?)\s*(?:of|de)?\s*(\d+)\s*(?:s|sec|segundos?)?')
+_RE_PROXY = compile_linear(
+    r'(?:proxy|through|via|trav[eé]s\s+de)\s+["\']?([\w.-]+:\d+)["\']?', re.IGNORECASE)
+
+# Literal words each extraction pattern cannot match without, checked with a substring test on the
+# lowercased instruction so patterns whose keywords are absent never run
+_PATTERN_TRIGGERS = {
+    _RE_RAW: ("raw", "crudo", "consola", "terminal"),
+    _RE_FORM_FILE: ("form",),
+    _RE_FILE_DATA: ("dat",),
+    _RE_URLENCODE: ("encoded",),
+    _RE_INLINE_DATA: ("dat", "body", "cuerpo", "payload", "json"),
+    _RE_HEADER: ("header", "cabecera", "encabezado"),
+    _RE_AUTH_HEADER: ("auth", "autorizaci"),
+    _RE_BEARER: ("bearer", "token"),
+    _RE_UA_PRESET: ("iphone", "android", "chrome", "firefox", "safari", "bot", "curl"),
+    _RE_UA_CUSTOM: ("user", "agente"),
+    _RE_SAVE_AS: ("save", "guardar", "salvar", "write", "escribir"),
+    _RE_INCLUDE_HEADERS: ("headers",),
+    _RE_USER_PASS: ("pass", "contrase"),
+    _RE_AUTH_PAIR: ("auth", "autenticaci"),
+    _RE_TIMEOUT: ("timeout", "wait", "espera", "limit"),
+    _RE_PROXY: ("proxy", "through", "via", "trav"),
+}
+# Every trigger word once, for spotting instructions that no gated pattern can match
+_ALL_TRIGGERS = tuple(dict.fromkeys(word for words in _PATTERN_TRIGGERS.values() for word in words))
+# Letters IGNORECASE matches to ASCII that str.lower() doesn't map to one ASCII letter
+# (dotted capital I lowers to two code points; dotless i and long s don't change)
+_TRIGGER_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
+# Response scanning patterns for curl output (-I redirect detection)
+_RE_REDIRECT_STATUS = re.compile(rb'HTTP/(?:1\.[01]|2) 30\d')
+_RE_LOCATION = re.compile(rb'^location:\s*(.+?)\s*$', re.IGNORECASE | re.MULTILINE)
+
+# Characters replaced by sanitize_filename, as a str.translate table
+_FILENAME_TRANS = str.maketrans({c: '_' for c in '\\/*?:"<>|'})
 
 
 def sanitize_filename(filename: str) -> str:
@@ -41,7 +274,7 @@ def sanitize_filename(filename: str) -> str:
     Basic filename sanitization.
     """
     # Remove potentially dangerous characters
-    filename = re.sub(r'[\\/*?:"<>|]', '_', filename)
+    filename = filename.translate(_FILENAME_TRANS)
     # Prevent path traversal (optional, depends on desired behavior)
     filename = os.path.basename(filename)
     # Limit length (optional)
@@ -55,28 +288,52 @@ def sanitize_filename(filename: str) -> str:
     return filename
 
 
-def build_curl_command_list(options: dict, url: str) -> list:
+def mask_credentials(value: str) -> str:
+    """
+    Helper Function for Display Masking.
+    Hides the password part of a user:password value.
+    """
+    username = value.split(":", 1)[0]
+    return f"{username}:********"
+
+
+# Options whose values must not be shown in the displayed command
+DISPLAY_MASKS = {"-u": mask_credentials}
+
+
+def iter_option_items(options: dict):
     """
-    Helper Function for Building Command List.
-    Builds the list of arguments for subprocess from options dict.
+    Helper Function for Walking Options.
+    Yields (option, value) once per occurrence of each flag; value is None for boolean flags.
+    Shared by the displayed command and the curl config so both read options the same way.
     """
-    command = ["curl"]
     if options is None:
-        options = {}
+        return
     for option, value in options.items():
         if isinstance(value, list):  # Handle options that appear multiple times (e.g., -H)
             for item in value:
-                command.append(option)
-                if item is not True:  # Avoid adding 'True' for boolean flags used in lists (unlikely)
-                    command.append(str(item))
+                # Avoid adding 'True' for boolean flags used in lists (unlikely)
+                yield option, None if item is True else str(item)
         elif value is True:  # Boolean flags (like -L, -I, -v, -k)
-            command.append(option)
+            yield option, None
         elif value is not False:  # Other options with single values (like -X, -d, -o, -A, -u, -m, -x)
-            command.append(option)
-            command.append(str(value))
+            yield option, str(value)
         # Ignore options explicitly set to False
-    command.append(url)
-    return command
+
+
+def iter_curl_args(options: dict, url: str, masks: dict = None):
+    """
+    Helper Function for Building Command Arguments.
+    Yields the curl arguments for the options dict in a single pass, applying
+    the optional per-option masks (used for the displayed command).
+    """
+    yield "curl"
+    for option, value in iter_option_items(options):
+        yield option
+        if value is not None:
+            mask = masks.get(option) if masks else None
+            yield mask(value) if mask else value
+    yield url
 
 
 @mcp.tool()
@@ -90,324 +347,706 @@ async def curl(instruction: str) -> str:
     Returns:
         The output of the curl command execution status and results.
     """
-    raw_output = re.search(r'\b(raw|crudo|consola|terminal)\b', instruction, re.IGNORECASE)
+    # Substring test first; the word-boundary regex only runs when a raw keyword is present
+    lowered = lower_for_triggers(instruction)
+    raw_output = search_triggered(_RE_RAW, lowered, lowered)
 
     try:
-        curl_options_data = parse_instruction(instruction)
+        if len(instruction) > PARSE_CACHE_MAX_INSTRUCTION:
+            curl_options_data = await asyncio.to_thread(parse_instruction, instruction)
+        else:
+            curl_options_data = parse_instruction(instruction)
 
         # Check if parsing itself returned an error message
-        if curl_options_data.get("error"):
-            return f"Error parsing instruction: {curl_options_data['error']}\nInstruction: {instruction}"
+        if curl_options_data.error:
+            return f"Error parsing instruction: {curl_options_data.error}\nInstruction: {instruction}"
 
-        # Use display_options for the command string shown to the user
-        options_for_display = curl_options_data.get("display_options", curl_options_data.get("options", {}))
-        if options_for_display is None:
-            options_for_display = {}
-        command_string_display = " ".join(build_curl_command_list(options_for_display, curl_options_data["url"]))
+        options = curl_options_data.options
 
         # Execute the parsed curl command using the real options
-        options_for_execution = curl_options_data.get("options", {})
-        if options_for_execution is None:
-            options_for_execution = {}
-        execution_result = execute_curl(options_for_execution, curl_options_data["url"])
-
-        # Combine command display with execution result
-        if raw_output:
-            # Even in raw mode, show command if execution failed
-            if execution_result.get("error"):
-                return f"Failed Command: {command_string_display}\n\nError:\n{execution_result['error']}\nOutput:\n{execution_result.get('output', '')}"
-            else:
-                return execution_result.get('output', '')  # Return only output on success
+        execution_result = await execute_curl(options, curl_options_data.url)
+
+        # Successful raw output is returned as-is; no command display is needed
+        if raw_output and not execution_result.get("error"):
+            return execution_result.get('output', '')  # Return only output on success
+
+        # The displayed command is built from the same options, with credentials masked
+        command_string_display = shlex.join(iter_curl_args(options, curl_options_data.url, DISPLAY_MASKS))
+
+        # Combine command display with execution result (even in raw mode, show command if execution failed)
+        if execution_result.get("error"):
+            # Prioritize specific execution error over generic message
+            error_msg = execution_result['error']
+            output_msg = execution_result.get('output', '')  # Include any partial output
+            return f"Failed Command: {command_string_display}\n\nError:\n{error_msg}\nOutput:\n{output_msg}"
         else:
-            if execution_result.get("error"):
-                # Prioritize specific execution error over generic message
-                error_msg = execution_result['error']
-                output_msg = execution_result.get('output', '')  # Include any partial output
-                return f"Failed Command: {command_string_display}\n\nError:\n{error_msg}\nOutput:\n{output_msg}"
-            else:
-                output_msg = execution_result.get('output', 'No output received.')
-                return f"Command executed: {command_string_display}\n\nResult:\n{output_msg}"
+            output_msg = execution_result.get('output', 'No output received.')
+            return f"Command executed: {command_string_display}\n\nResult:\n{output_msg}"
 
     except Exception as e:
-        # Catch unexpected errors during the whole process
-        # Log the full error for debugging
-        print(f"Unexpected error processing instruction: {instruction}\nError: {e}")
+        # Catch unexpected errors during the whole process (including parsing)
+        # Log the full traceback server-side; stdout carries the stdio transport
+        logger.exception("Unexpected error processing instruction: %s", instruction)
         # Provide a user-friendly message
         return f"Unexpected error processing instruction. Please check logs or try rephrasing. Error: {str(e)}"
 
 
-def parse_instruction(instruction: str) -> dict:
+@dataclass(slots=True)
+class ParsedInstruction:
+    """Result of parsing an instruction: the target URL, curl options keyed by flag, and any parse error."""
+    url: str = ""
+    options: dict = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+def has_trigger(pattern, lowered: str) -> bool:
+    """
+    Helper Function for Gated Matching.
+    Tells whether one of the pattern's trigger words occurs in the lowered instruction.
+    """
+    for word in _PATTERN_TRIGGERS[pattern]:
+        if word in lowered:
+            return True
+    return False
+
+
+def search_triggered(pattern, instruction: str, lowered: str):
+    """Runs pattern.search only when the pattern's trigger words allow a match."""
+    return pattern.search(instruction) if has_trigger(pattern, lowered) else None
+
+
+def lower_for_triggers(instruction: str) -> str:
+    """Lowercases the instruction for trigger-word checks, folding the letters IGNORECASE maps to ASCII."""
+    if instruction.isascii():
+        return instruction.lower()
+    return instruction.translate(_TRIGGER_FOLD).lower()
+
+
+def parse_instruction(instruction: str) -> ParsedInstruction:
+    """
+    Parse a natural language instruction into curl command options.
+    Results for repeated instructions come from an LRU cache; each call gets its own options dict.
+    """
+    if len(instruction) > PARSE_CACHE_MAX_INSTRUCTION:
+        return parse_instruction_uncached(instruction)
+    url, frozen_options, error = parse_instruction_frozen(instruction)
+    options = {option: list(value) if isinstance(value, tuple) else value for option, value in frozen_options}
+    return ParsedInstruction(url, options, error)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_instruction_frozen(instruction: str) -> tuple:
+    """
+    Helper Function for Caching Parses.
+    Returns the parse as an immutable (url, options_items, error) tuple so it can be shared across calls.
+    """
+    result_data = parse_instruction_uncached(instruction)
+    frozen_options = tuple(
+        (option, tuple(value) if isinstance(value, list) else value)
+        for option, value in result_data.options.items()
+    )
+    return result_data.url, frozen_options, result_data.error
+
+
+# Performance note: do not wrap the parser in numba.jit/njit. nopython mode rejects re and
+# general str work, and object mode only adds dispatch overhead to string-heavy code. The
+# speedups here come from precompiled patterns, trigger gating, re2 and the parse cache.
+def parse_instruction_uncached(instruction: str) -> ParsedInstruction:
     """Parse a natural language instruction into curl command options."""
-    result_data = {
-        "url": "",
-        "options": {},
-        "display_options": None,  # Will be created if masking is needed
-        "error": None
+    result_data = ParsedInstruction()
+    options = result_data.options  # Shortcut
+
+    # 1. Extract URL (More robustly)
+    #    Prioritize explicit URLs, then keywords, then generic domain-like patterns.
+    extracted_url = None
+    url_match = None
+    # Most instructions carry an explicit URL: find the scheme separator with str.find
+    # and anchor the full-URL pattern on it instead of scanning with the regex engine
+    idx = instruction.find('://')
+    while idx >= 0 and not url_match:
+        url_match = _RE_FULL_URL.match(instruction, max(idx - 5, 0)) or _RE_FULL_URL.match(instruction, max(idx - 4, 0))
+        idx = instruction.find('://', idx + 3)
+    if not url_match:
+        # Patterns are ordered by priority; take the first that matches
+        url_match = next(filter(None, (pattern.search(instruction) for pattern in _RE_DOMAIN_URL_PATTERNS)), None)
+    if url_match:
+        # Find the right group (usually the last one with content)
+        url = next((g for g in reversed(url_match.groups()) if g), url_match.group(0))
+        url = url.strip(_URL_STRIP_CHARS)  # Clean surrounding punctuation
+
+        # Add http:// if no protocol is specified (check must be case-insensitive)
+        if not lower_for_triggers(url[:8]).startswith(_URL_SCHEMES):
+            # Avoid adding http:// if it looks like a filename for -d @filename or -F name=@filename
+            if not (url.startswith('@') or '=' in url):  # Basic check, might need refinement
+                url = 'http://' + url
+
+        extracted_url = url
+
+    if not extracted_url:
+        result_data.error = "Could not extract a valid URL."
+        return result_data
+    result_data.url = extracted_url
+
+    # Lowered once: trigger-word checks use it, and so do the patterns whose captures are
+    # case-insensitive anyway, which are compiled without IGNORECASE and match it directly
+    lowered = lower_for_triggers(instruction)
+    # Classify every single-word keyword in one pass over the instruction
+    keywords = {match.lastgroup for match in _RE_KEYWORDS.finditer(lowered)}
+
+    # Fast path for the common plain-URL shape: with no keyword and no trigger word present,
+    # every later step is a no-op except the default redirect following
+    if not keywords and not any(word in lowered for word in _ALL_TRIGGERS):
+        options["-L"] = True
+        return result_data
+
+    # 2. Detect Method (HEAD, POST, PUT, DELETE) - Default GET
+    head_only = "head" in keywords and "head_qualifier" in keywords
+    if head_only:
+        options["-I"] = True
+    else:
+        method = next((method for keyword, method in _METHOD_KEYWORDS if keyword in keywords), None)
+        if method:
+            options["-X"] = method
+    # GET is the default if no method specified and not -I
+
+    # 3. Follow Redirects (-L) - Default ON unless HEAD or explicitly disabled
+    if not head_only and "no_follow" not in keywords:
+        options["-L"] = True
+    elif "follow" in keywords or "no_follow" in keywords:
+        options["-L"] = True  # Explicitly enable if requested
+
+    # 4. Data Handling (-d, -d @file, --data-urlencode, -F) - Prioritize specific forms
+    data_payload = None
+    content_type_json = False
+
+    # 4a. Form data (-F) - Higher priority
+    form_match = search_triggered(_RE_FORM_FILE, instruction, lowered)
+    if form_match:
+        field_name = form_match.group(2)
+        file_path = form_match.group(4)  # Needs validation/sanitization if path allowed
+        options["-F"] = f"{field_name}=@{file_path}"
+    else:
+        # 4b. Data from file (-d @file)
+        file_data_match = search_triggered(_RE_FILE_DATA, instruction, lowered)
+        if file_data_match:
+            file_path = file_data_match.group(2)  # Needs validation/sanitization
+            options["-d"] = f"@{file_path}"
+        else:
+            # 4c. URL Encoded data (--data-urlencode)
+            urlencode_match = search_triggered(_RE_URLENCODE, instruction, lowered)
+            if urlencode_match:
+                # Use a non-greedy match for the data
+                options["--data-urlencode"] = urlencode_match.group(2).strip()
+            else:
+                # 4d. Inline data (-d) - Lowest priority for data types
+                # Look for explicit data keywords followed by quoted string or JSON structure
+                inline_data_match = search_triggered(_RE_INLINE_DATA, instruction, lowered)
+                if inline_data_match:
+                    # Extract data from the correct group
+                    # An empty quoted payload leaves every group empty
+                    data_payload = inline_data_match.group(1) or inline_data_match.group(
+                        2) or inline_data_match.group(3) or inline_data_match.group(4) or ''
+                    data_payload = data_payload.strip()
+                    if data_payload:
+                        options["-d"] = data_payload
+                        # Check if it looks like JSON or was explicitly mentioned
+                        if inline_data_match.group(3) or inline_data_match.group(4) or \
+                           _RE_JSON_WORD.search(inline_data_match.group(0) or ''):  # Check keyword near data
+                            content_type_json = True
+
+    # 5. Headers (-H) - Detect multiple headers, including common ones
+    # Initialize headers list (crucial for append logic); the set gives O(1) duplicate checks
+    headers_list = []
+    headers_seen = set()
+    has_authorization = False
+
+    def add_header(header: str):
+        if header not in headers_seen:  # Avoid duplicates
+            headers_seen.add(header)
+            headers_list.append(header)
+
+    # Add Content-Type if JSON data was detected
+    if content_type_json:
+        add_header("Content-Type: application/json")
+
+    # General Header Pattern
+    header_matches = _RE_HEADER.finditer(instruction) if has_trigger(_RE_HEADER, lowered) else ()
+    for match in header_matches:
+        header = match.group(2).strip()
+        add_header(header)
+        has_authorization = has_authorization or header.lower().startswith("authorization:")
+
+    # Specific Header Patterns (like Authorization)
+    auth_header_match = search_triggered(_RE_AUTH_HEADER, instruction, lowered)
+    if auth_header_match:
+        add_header(f"Authorization: {auth_header_match.group(2).strip()}")
+        has_authorization = True
+
+    bearer_match = search_triggered(_RE_BEARER, instruction, lowered)
+    # Avoid adding if already added via auth_header_match
+    if bearer_match and not has_authorization:
+        add_header(f"Authorization: Bearer {bearer_match.group(2).strip()}")
+
+    # Add detected headers to options (only if list is not empty)
+    if headers_list:
+        options["-H"] = headers_list
+
+    # 6. User Agent (-A)
+    ua_match = search_triggered(_RE_UA_PRESET, lowered, lowered)
+    custom_ua_match = search_triggered(_RE_UA_CUSTOM, instruction, lowered)
+
+    if ua_match:
+        agent_key = ua_match.group(1).lower()
+        options["-A"] = _USER_AGENTS.get(agent_key, _USER_AGENTS["chrome"])  # Default to Chrome if unknown keyword
+    elif custom_ua_match:
+        options["-A"] = custom_ua_match.group(2).strip()
+
+    # 7. Save to File (-o)
+    save_match = search_triggered(_RE_SAVE_AS, instruction, lowered)
+    if save_match:
+        filename = save_match.group(1).strip()
+        options["-o"] = sanitize_filename(filename)  # Sanitize the filename
+    elif "save" in keywords:  # Save without specific name
+        path = urlparse(result_data.url).path
+        filename = path.split('/')[-1] if path and path != '/' else "output.html"
+        if not filename:
+            filename = "output.html"
+        options["-o"] = sanitize_filename(filename)  # Sanitize default name too
+
+    # 8. Verbose (-v)
+    if "verbose" in keywords:
+        options["-v"] = True
+
+    # 9. Silent (-s) - Can override verbose if specified
+    if "silent" in keywords:
+        options["-s"] = True
+        options.pop("-v", None)  # -s usually overrides -v
+
+    # 10. Include Headers in Output (-i)
+    if search_triggered(_RE_INCLUDE_HEADERS, lowered, lowered) and not head_only:
+        options["-i"] = True
+
+    # 11. Authentication (-u user:pass)
+    # Pattern 1: user X and password Y
+    auth_match1 = search_triggered(_RE_USER_PASS, instruction, lowered)
+    # Pattern 2: auth user:pass
+    auth_match2 = search_triggered(_RE_AUTH_PAIR, instruction, lowered)
+
+    username, password = None, None
+    if auth_match1:
+        username, password = auth_match1.group(1), auth_match1.group(2)
+    elif auth_match2:
+        username, password = auth_match2.group(1), auth_match2.group(2)  # Corrected group indices
+
+    if username and password:
+        options["-u"] = f"{username}:{password}"  # Masked by DISPLAY_MASKS when displayed
+
+    # 12. Insecure SSL (-k)
+    if "insecure" in keywords:
+        options["-k"] = True
+
+    # 13. Timeout (-m seconds)
+    timeout_match = search_triggered(_RE_TIMEOUT, lowered, lowered)
+    if timeout_match:
+        options["-m"] = timeout_match.group(1)
+
+    # 14. Proxy (-x host:port)
+    proxy_match = search_triggered(_RE_PROXY, instruction, lowered)
+    if proxy_match:
+        options["-x"] = proxy_match.group(1)
+
+    # --- Final check and return ---
+    return result_data
+
+
+def get_httpx_client(verify: bool) -> httpx.AsyncClient:
+    """
+    Helper Function for Client Selection.
+    Returns the shared client, or the shared -k one since httpx binds verification per client.
+    """
+    client = _HTTPX_CLIENTS.get(verify)
+    if client is None:
+        client = httpx.AsyncClient(http2=True, verify=verify, limits=_HTTPX_LIMITS, cookies=_NO_COOKIES)
+        _HTTPX_CLIENTS[verify] = client
+    return client
+
+
+def create_proxy_client(verify: bool, proxy: str) -> httpx.AsyncClient:
+    """
+    Helper Function for -x.
+    Builds a one-off client for the proxy; the caller closes it. Like curl, a proxy without a
+    scheme is taken as http://. Raises ValueError if httpx can't use the proxy URL.
+    """
+    if "://" not in proxy:
+        proxy = "http://" + proxy
+    try:
+        proxy_url = httpx.URL(proxy)
+    except httpx.InvalidURL as e:
+        raise ValueError(str(e)) from e
+    # httpx drops the scheme's default port, so None means 80/443
+    if not proxy_url.host or (proxy_url.port is not None and not 0 < proxy_url.port < 65536):
+        raise ValueError("expected host:port with a port between 1 and 65535")
+    return httpx.AsyncClient(http2=True, verify=verify, proxy=proxy_url, cookies=_NO_COOKIES)
+
+
+def read_data_file(file_path: str) -> bytes:
+    """
+    Helper Function for -d @file.
+    Reads the file like curl does, stripping carriage returns and newlines.
+    """
+    with open(file_path, 'rb') as f:
+        return f.read().replace(b'\r', b'').replace(b'\n', b'')
+
+
+async def options_to_httpx(options: dict, url: str) -> dict:
+    """
+    Helper Function for Translating Options.
+    Maps the curl options dict to keyword arguments for httpx.AsyncClient.request().
+    Async because -d @file is read in a worker thread, off the event loop.
+    """
+    # (name, value) pairs rather than a dict: like curl, a header given twice is sent twice
+    headers = []
+    # -H is always a list (parse_instruction only ever stores it that way)
+    for header in options.get("-H", ()):
+        name, _, value = header.partition(":")
+        headers.append((name.strip(), value.strip()))
+    if options.get("-A"):
+        headers = [(name, value) for name, value in headers if name.lower() != "user-agent"]
+        headers.append(("User-Agent", options["-A"]))
+    elif not any(name.lower() == "user-agent" for name, _ in headers):
+        # Identify as the installed curl, as the command we display would
+        headers.append(("User-Agent", _CURL_USER_AGENT))
+
+    content = None
+    if "-d" in options:
+        data = options["-d"]
+        content = await asyncio.to_thread(read_data_file, data[1:]) if data.startswith("@") else data.encode()
+    elif "--data-urlencode" in options:
+        # curl only encodes the part after the first '=' when a name is given
+        name, sep, value = options["--data-urlencode"].partition("=")
+        content = (f"{name}={quote(value, safe='')}" if sep else quote(name, safe='')).encode()
+    if content is not None and not any(name.lower() == "content-type" for name, _ in headers):
+        headers.append(("Content-Type", "application/x-www-form-urlencoded"))
+
+    if options.get("-I"):
+        method = "HEAD"
+    else:
+        method = options.get("-X") or ("POST" if content is not None else "GET")
+
+    request_kwargs = {
+        "method": method,
+        "url": url,
+        "headers": headers,
+        "content": content,
+        "timeout": float(options.get("-m", 30)) or None,  # -m 0 means no limit, as in curl
+        "follow_redirects": bool(options.get("-L", False)),
     }
-    options = result_data["options"]  # Shortcut
+    if options.get("-u"):
+        username, _, password = options["-u"].partition(":")
+        request_kwargs["auth"] = httpx.BasicAuth(username, password)
+    return request_kwargs
+
+
+def format_response_head(response: httpx.Response) -> str:
+    """
+    Helper Function for -I / -i Output.
+    Renders the status line and headers the way curl prints them.
+    """
+    lines = [f"{response.http_version} {response.status_code} {response.reason_phrase}".rstrip()]
+    lines.extend(f"{name}: {value}" for name, value in response.headers.multi_items())
+    return "\r\n".join(lines) + "\r\n\r\n"
+
+
+async def save_response_body(response: httpx.Response, filename: str) -> int:
+    """
+    Helper Function for -o.
+    Streams the response body to disk chunk by chunk and returns the bytes written.
+    """
+    written = 0
+    with open(filename, 'wb') as f:
+        async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+            await asyncio.to_thread(f.write, chunk)
+            written += len(chunk)
+    return written
+
+
+async def read_response_body(response: httpx.Response, limit: int) -> tuple:
+    """
+    Helper Function for Capturing Output.
+    Reads at most `limit` bytes of the body; returns (body, truncated).
+    """
+    body = bytearray()
+    async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+        if len(body) + len(chunk) > limit:
+            body += chunk[:limit - len(body)]
+            return bytes(body), True
+        body += chunk
+    return bytes(body), False
 
+
+def connect_error_cause(error: BaseException):
+    """
+    Helper Function for Connection Errors.
+    Follows the exception chain to the resolver or refused-connection error behind an httpx.ConnectError.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, (socket.gaierror, ConnectionRefusedError)):
+            return error
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return None
+
+
+async def execute_curl(options: dict, url: str) -> dict:
+    """Execute the request described by the parsed curl options and return structured result."""
+    # Multipart uploads keep true curl semantics (HEAD (-I) never needs the binary for them), and
+    # verbose (-v) traces are curl's own output, which httpx has no equivalent for
+    if options.get("-v") or ("-F" in options and not options.get("-I")):
+        return await execute_curl_subprocess(options, url)
+
+    result_info = {
+        "output": "",
+        "error": None,
+        "return_code": None
+    }
+    verify = not options.get("-k", False)
+    proxy = options.get("-x")
+    if proxy:
+        try:
+            client = create_proxy_client(verify, proxy)
+        except ValueError as e:
+            result_info["error"] = f"Proxy Error: Invalid proxy '{proxy}': {e}"
+            result_info["return_code"] = 5  # curl's "couldn't resolve proxy"
+            return result_info
+    else:
+        client = get_httpx_client(verify)
     try:
-        # 1. Extract URL (More robustly)
-        #    Prioritize explicit URLs, then keywords, then generic domain-like patterns.
-        url_patterns = [
-            r'https?://[^\s"\'<>]+',                      # Full URL (highest priority)
-            r'(?:url|uri|site|sitio|endpoint|address)\s*[:=]?\s*\'?("?)(https?://[^\s"\'<>]+)\1\'?',  # url: https://...
-            # url: example.com/path
-            r'(?:url|uri|site|sitio|endpoint|address)\s*[:=]?\s*\'?("?)([a-zA-Z0-9.-]+\.[a-zA-Z]{2,}[^\s"\'<>]*)\1\'?',
-            r'\bto\s+([a-zA-Z0-9.-]+\.[a-zA-Z]{2,}[^\s"\'<>]*)\b',  # request to example.com
-            r'\b(?:on|at|for)\s+([a-zA-Z0-9.-]+\.[a-zA-Z]{2,}[^\s"\'<>]*)\b',  # get headers for example.com
-            r'\b([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b'          # Bare domain (lowest priority)
-        ]
-        extracted_url = None
-        for i, pattern in enumerate(url_patterns):
-            url_match = re.search(pattern, instruction, re.IGNORECASE)
-            if url_match:
-                # Find the right group (usually the last one with content)
-                url = next((g for g in reversed(url_match.groups()) if g), url_match.group(0))
-                url = url.strip('.,:;"\'')  # Clean surrounding punctuation
-
-                # Add http:// if no protocol is specified (check must be case-insensitive)
-                if not re.match(r'^https?://', url, re.IGNORECASE):
-                    # Avoid adding http:// if it looks like a filename for -d @filename or -F name=@filename
-                    if not (url.startswith('@') or '=' in url):  # Basic check, might need refinement
-                        url = 'http://' + url
-
-                extracted_url = url
-                # Maybe remove the matched URL part from instruction to avoid re-parsing? (Careful)
-                # instruction = instruction[:url_match.start()] + instruction[url_match.end():]
-                break  # Stop after first match (patterns ordered by priority)
-
-        if not extracted_url:
-            result_data["error"] = "Could not extract a valid URL."
-            return result_data
-        result_data["url"] = extracted_url
-
-        # 2. Detect Method (HEAD, POST, PUT, DELETE) - Default GET
-        # Use \b for word boundaries to avoid matching 'posting' as POST
-        if re.search(r'\b(head|headers?|cabeceras?|encabezados?)\b', instruction, re.IGNORECASE) and \
-           re.search(r'\b(only|just|solo|solamente|show|mostrar|obtener|get)\b', instruction, re.IGNORECASE):
-            options["-I"] = True
-        elif re.search(r'\bpost\b|\benví[ao](r)?\b|\bsubmit\b|\bsend\b', instruction, re.IGNORECASE):
-            options["-X"] = "POST"
-        elif re.search(r'\bput\b|\bactualiz[ao](r)?\b|\bupdate\b', instruction, re.IGNORECASE):
-            options["-X"] = "PUT"
-        elif re.search(r'\bdelete\b|\belimin[ao](r)?\b|\bremove\b', instruction, re.IGNORECASE):
-            options["-X"] = "DELETE"
-        elif re.search(r'\boptions\b', instruction, re.IGNORECASE):
-            options["-X"] = "OPTIONS"
-        elif re.search(r'\bpatch\b|\bparch[ea](r)?\b', instruction, re.IGNORECASE):
-            options["-X"] = "PATCH"
-        # GET is the default if no method specified and not -I
-
-        # 3. Follow Redirects (-L) - Default ON unless HEAD or explicitly disabled
-        if " -I" not in options and not re.search(r'\b(no|not|sin)\s+(follow|seguir)\s+redirects?', instruction, re.IGNORECASE):
-            options["-L"] = True
-        elif re.search(r'\b(follow|seguir)\s+redirects?', instruction, re.IGNORECASE):
-            options["-L"] = True  # Explicitly enable if requested
-
-        # 4. Data Handling (-d, -d @file, --data-urlencode, -F) - Prioritize specific forms
-        data_payload = None
-        content_type_json = False
-
-        # 4a. Form data (-F) - Higher priority
-        form_match = re.search(
-            r'(?:form|formulario)\s+(?:field|campo)\s+(["\']?)([^"\']+)\1\s+(?:with|con)\s+(?:file|archivo)\s+(["\']?)([^"\']+)\3', instruction, re.IGNORECASE)
-        if form_match:
-            field_name = form_match.group(2)
-            file_path = form_match.group(4)  # Needs validation/sanitization if path allowed
-            options["-F"] = f"{field_name}=@{file_path}"
-        else:
-            # 4b. Data from file (-d @file)
-            file_data_match = re.search(
-                r'(?:data|datos)\s+(?:from|desde)\s+(?:file|archivo)\s+(["\']?)([^"\']+)\1', instruction, re.IGNORECASE)
-            if file_data_match:
-                file_path = file_data_match.group(2)  # Needs validation/sanitization
-                options["-d"] = f"@{file_path}"
+        request_kwargs = await options_to_httpx(options, url)
+        async with client.stream(**request_kwargs) as response:
+            result_info["return_code"] = 0
+            head = format_response_head(response)
+            if options.get("-I"):
+                result_info["output"] = head
+            elif options.get("-o"):
+                # Body goes straight to disk; never held in memory
+                output_file = options["-o"]
+                written = await save_response_body(response, output_file)
+                result_info["output"] = (head if options.get("-i") else "") + f"Saved {written} bytes to {output_file}"
             else:
-                # 4c. URL Encoded data (--data-urlencode)
-                urlencode_match = re.search(
-                    r'(?:urlencoded|encoded)\s+(?:data|datos)\s+(["\']?)(.+?)\1(?:\s|$)', instruction, re.IGNORECASE)
-                if urlencode_match:
-                    # Use a non-greedy match for the data
-                    options["--data-urlencode"] = urlencode_match.group(2).strip()
-                else:
-                    # 4d. Inline data (-d) - Lowest priority for data types
-                    # Look for explicit data keywords followed by quoted string or JSON structure
-                    inline_data_match = re.search(
-                        r'(?:data|datos|body|cuerpo|payload|json)\s*[:=]?\s*'
-                        r'(?:(["\'])(.*?)\1|(\{.*?\})|(\[.*?\]))',  # Quoted string OR {json} OR [json_array]
-                        instruction, re.IGNORECASE | re.DOTALL  # DOTALL for multiline JSON
-                    )
-                    if inline_data_match:
-                        # Extract data from the correct group
-                        data_payload = inline_data_match.group(
-                            2) or inline_data_match.group(3) or inline_data_match.group(4)
-                        data_payload = data_payload.strip()
-                        if data_payload:
-                            options["-d"] = data_payload
-                            # Check if it looks like JSON or was explicitly mentioned
-                            if inline_data_match.group(3) or inline_data_match.group(4) or \
-                               re.search(r'\bjson\b', inline_data_match.group(0) or '', re.IGNORECASE):  # Check keyword near data
-                                content_type_json = True
-
-        # 5. Headers (-H) - Detect multiple headers, including common ones
-        # Initialize headers list (crucial for append logic)
-        headers_list = []
-
-        # Add Content-Type if JSON data was detected
-        if content_type_json:
-            headers_list.append("Content-Type: application/json")
-
-        # General Header Pattern
-        # Header: Value (non-greedy value)
-        header_pattern = r'(?:header|cabecera|encabezado)\s*[:=]?\s*(["\']?)([\w-]+:\s*.*?)\1(?=[\s,\.]|$)'
-        for match in re.finditer(header_pattern, instruction, re.IGNORECASE):
-            header = match.group(2).strip()
-            if header not in headers_list:  # Avoid duplicates
-                headers_list.append(header)
-
-        # Specific Header Patterns (like Authorization)
-        auth_header_match = re.search(
-            r'(?:auth(?:orization)?|autorizaci[oó]n)\s*[:=]?\s*(["\']?)(\w+\s+[^"\']+?)\1', instruction, re.IGNORECASE)
-        if auth_header_match:
-            header = f"Authorization: {auth_header_match.group(2).strip()}"
-            if header not in headers_list:
-                headers_list.append(header)
-
-        bearer_match = re.search(r'(?:bearer|token)\s*[:=]?\s*(["\']?)([^"\']+?)\1', instruction, re.IGNORECASE)
-        # Avoid adding if already added via auth_header_match
-        if bearer_match and not any(h.lower().startswith("authorization:") for h in headers_list):
-            header = f"Authorization: Bearer {bearer_match.group(2).strip()}"
-            if header not in headers_list:
-                headers_list.append(header)
-
-        # Add detected headers to options (only if list is not empty)
-        if headers_list:
-            options["-H"] = headers_list
-
-        # 6. User Agent (-A)
-        ua_match = re.search(
-            r'(?:user[-\s]*agent|agente\s*de\s*usuario|as|como)\s+["\']?(iphone|android|chrome|firefox|safari|bot|curl)[\'"]?', instruction, re.IGNORECASE)
-        custom_ua_match = re.search(
-            r'(?:user[-\s]*agent|agente\s*de\s*usuario)\s*[:=]?\s*(["\'])(.+?)\1', instruction, re.IGNORECASE)
-
-        if ua_match:
-            agent_key = ua_match.group(1).lower()
-            user_agents = {
-                "iphone": "Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Mobile/15E148 Safari/604.1",
-                "android": "Mozilla/5.0 (Linux; Android 10; SM-A205U) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Mobile Safari/537.36",
-                "chrome": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Safari/537.36",
-                "firefox": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/112.0",
-                "safari": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.4 Safari/605.1.15",
-                "bot": "Googlebot/2.1 (+http://www.google.com/bot.html)",
-                # Get actual curl version
-                "curl": f"curl/{subprocess.check_output(['curl', '--version']).decode().split()[1]}"
-            }
-            options["-A"] = user_agents.get(agent_key, user_agents["chrome"])  # Default to Chrome if unknown keyword
-        elif custom_ua_match:
-            options["-A"] = custom_ua_match.group(2).strip()
-
-        # 7. Save to File (-o)
-        save_match = re.search(
-            r'(?:save|guardar|salvar|write|escribir)\s+(?:to|en|as|como)\s+(?:file|archivo)?\s*["\']?([^"\']+)["\']?', instruction, re.IGNORECASE)
-        if save_match:
-            filename = save_match.group(1).strip()
-            options["-o"] = sanitize_filename(filename)  # Sanitize the filename
-        elif re.search(r'\b(save|guardar|salvar|output|salida)\b', instruction, re.IGNORECASE):  # Save without specific name
-            path = urlparse(result_data["url"]).path
-            filename = path.split('/')[-1] if path and path != '/' else "output.html"
-            if not filename:
-                filename = "output.html"
-            options["-o"] = sanitize_filename(filename)  # Sanitize default name too
-
-        # 8. Verbose (-v)
-        if re.search(r'\b(verbose|detallado|details|detalles)\b', instruction, re.IGNORECASE):
-            options["-v"] = True
-
-        # 9. Silent (-s) - Can override verbose if specified
-        if re.search(r'\b(silent|silencioso|quiet|callado)\b', instruction, re.IGNORECASE):
-            options["-s"] = True
-            if "-v" in options:
-                del options["-v"]  # -s usually overrides -v
-
-        # 10. Include Headers in Output (-i)
-        if re.search(r'\b(include|incluir|show|mostrar|with)\s+headers\b', instruction, re.IGNORECASE) and "-I" not in options:
-            options["-i"] = True
-
-        # 11. Authentication (-u user:pass)
-        # Pattern 1: user X and password Y
-        auth_match1 = re.search(
-            r'(?:user|usuario)\s+["\']?([^"\']+)["\']?\s+(?:and|y|with|con)\s+(?:password|pass|contraseña)\s+["\']?([^"\']+)["\']?', instruction, re.IGNORECASE)
-        # Pattern 2: auth user:pass
-        auth_match2 = re.search(
-            r'(?:auth(?:entication)?|autenticaci[oó]n)\s*[:=]?\s*["\']?([^:"]+):([^"\']+)["\']?', instruction, re.IGNORECASE)
-
-        username, password = None, None
-        if auth_match1:
-            username, password = auth_match1.group(1), auth_match1.group(2)
-        elif auth_match2:
-            username, password = auth_match2.group(1), auth_match2.group(2)  # Corrected group indices
-
-        if username and password:
-            options["-u"] = f"{username}:{password}"
-            # Create display_options ONLY if needed (i.e., auth found)
-            result_data["display_options"] = options.copy()  # Start with a copy of real options
-            result_data["display_options"]["-u"] = f"{username}:********"  # Mask password
-
-        # 12. Insecure SSL (-k)
-        if re.search(r'(?:insecure|unsafe|skip|salta(?:r)?|ignore|ignora(?:r)?)\s+(?:ssl|cert|verification|verificaci[oó]n)', instruction, re.IGNORECASE):
-            options["-k"] = True
-
-        # 13. Timeout (-m seconds)
-        timeout_match = re.search(
-            r'(?:timeout|wait|espera|limit(?:e)?)\s*(?:of|de)?\s*(\d+)\s*(?:s|sec|segundos?)?', instruction, re.IGNORECASE)
-        if timeout_match:
-            options["-m"] = timeout_match.group(1)
-
-        # 14. Proxy (-x host:port)
-        proxy_match = re.search(
-            r'(?:proxy|through|via|trav[eé]s\s+de)\s+["\']?([\w.-]+:\d+)["\']?', instruction, re.IGNORECASE)
-        if proxy_match:
-            options["-x"] = proxy_match.group(1)
-
-        # --- Final check and return ---
-        return result_data
+                body, truncated = await read_response_body(response, MAX_OUTPUT_BYTES)
+                text = body.decode(response.encoding or "utf-8", errors="replace")
+                result_info["output"] = head + text if options.get("-i") else text
+                if truncated:
+                    result_info["output"] += f"\n--- Info ---\nOutput truncated at {MAX_OUTPUT_BYTES} bytes (use 'save' to write the full response to a file)"
+
+            # Specific handling for HEAD (-I) redirects (informational, not an error)
+            if options.get("-I") and not options.get("-L", False) and response.is_redirect:
+                location = response.headers.get("location")
+                if location:
+                    result_info["output"] += f"\n--- Info ---\nRedirect detected to: {location}\n(Use '-L' or 'follow redirects' to follow)"
+
+        return result_info
 
+    except httpx.TimeoutException:
+        result_info["error"] = "Timeout Error: The connection timed out."
+        result_info["return_code"] = 28
+        return result_info
+    except httpx.ConnectError as e:
+        # httpx's own message is generic ("All connection attempts failed"); classify by the socket error
+        cause = connect_error_cause(e)
+        if isinstance(cause, socket.gaierror):
+            if proxy:
+                result_info["error"] = f"DNS Error: Could not resolve proxy '{proxy}'."
+                result_info["return_code"] = 5
+            else:
+                result_info["error"] = f"DNS Error: Could not resolve host '{urlparse(url).hostname}'."
+                result_info["return_code"] = 6
+        elif isinstance(cause, ConnectionRefusedError):
+            result_info["error"] = "Connection Error: Connection refused by server."
+            result_info["return_code"] = 7
+        else:
+            result_info["error"] = f"Connection Error: {e}"
+            result_info["return_code"] = 7
+        return result_info
+    except httpx.HTTPError as e:
+        result_info["error"] = f"HTTP Error: {type(e).__name__}: {e}"
+        result_info["return_code"] = -1
+        return result_info
+    except OSError as e:
+        # Reading -d @file or writing -o failed
+        result_info["error"] = f"File Error: {e}"
+        result_info["return_code"] = -1
+        return result_info
     except Exception as e:
-        # Log the detailed error server-side
-        print(f"Error during parsing instruction: '{instruction}'\n{type(e).__name__}: {e}")
-        # Return a dictionary indicating failure
-        result_data["error"] = f"Internal error during parsing: {str(e)}"
-        return result_data
+        logger.exception("Error executing request: %s", url)
+        result_info["error"] = f"Internal error during execution: {str(e)}"
+        result_info["return_code"] = -1
+        return result_info
+    finally:
+        if proxy:
+            await client.aclose()
 
 
-def execute_curl(options: dict, url: str) -> dict:
-    """Execute the curl command with the parsed options and return structured result."""
+# Environment for curl workers, assembled once: shell-display variables curl never reads are dropped
+_CURL_ENV_EXCLUDE = frozenset(("LS_COLORS", "LSCOLORS", "PS1", "PS2", "PROMPT_COMMAND", "HISTFILE", "HISTSIZE"))
+_CURL_ENV = {key: value for key, value in os.environ.items() if key not in _CURL_ENV_EXCLUDE}
+
+# Long option names used when an options dict is written as a curl config file (`curl -K -`)
+CURL_CONFIG_NAMES = {
+    "-X": "request", "-H": "header", "-d": "data", "-F": "form", "-u": "user", "-A": "user-agent",
+    "-o": "output", "-m": "max-time", "-x": "proxy", "-k": "insecure", "-L": "location",
+    "-I": "head", "-i": "include", "-v": "verbose", "-s": "silent"
+}
+
+
+def quote_curl_config(value) -> str:
+    """
+    Helper Function for Config Quoting.
+    Quotes a value for curl's config-file syntax.
+    """
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
+    return f'"{escaped}"'
+
+
+def build_curl_config(options: dict, url: str) -> str:
+    """
+    Helper Function for Building a Curl Config.
+    Renders the options dict in curl config-file syntax, for workers started with `curl -K -`.
+    """
+    lines = []
+    for option, value in iter_option_items(options):
+        name = CURL_CONFIG_NAMES.get(option, option.lstrip("-"))
+        lines.append(name if value is None else f"{name} = {quote_curl_config(value)}")
+    # stderr shares the output pipe, so keep the progress meter out of it
+    lines.append("no-progress-meter")
+    lines.append(f"url = {quote_curl_config(url)}")
+    return "\n".join(lines) + "\n"
+
+
+class CurlWorkerPool:
+    """
+    Pool of pre-started `curl -K -` processes.
+    Each idle worker is already exec'd and blocked reading its config from stdin, so a
+    request only writes the config instead of paying fork/exec. Workers are single-use;
+    the pool is topped back up in the background after each checkout.
+    The pool starts empty: no curl process runs until the first request that needs the binary
+    (-F or -v), which is rare since httpx serves everything else. Hence 4 idle workers rather
+    than 8; that covers a burst of uploads while keeping the standing process count small.
+    """
+
+    def __init__(self, size: int = 4):
+        self.size = size
+        self._idle = []
+        self._lock = asyncio.Lock()
+        self._refill_task = None
+
+    async def _spawn(self) -> asyncio.subprocess.Process:
+        return await asyncio.create_subprocess_exec(
+            _CURL_PATH, "-K", "-",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,  # One pipe: curl's messages land in the output
+            env=_CURL_ENV,
+            # Our own fds are non-inheritable already; skipping the close pass lets CPython use posix_spawn/vfork
+            close_fds=False
+        )
+
+    async def _refill(self):
+        try:
+            async with self._lock:
+                while len(self._idle) < self.size:
+                    self._idle.append(await self._spawn())
+        except OSError as e:
+            logger.warning("Could not start curl worker: %s", e)
+
+    async def _acquire(self) -> asyncio.subprocess.Process:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.returncode is None:  # Still waiting for its config
+                return worker
+        # Pool empty (first use, or workers crashed): start one directly
+        return await self._spawn()
+
+    @staticmethod
+    async def _exchange(worker: asyncio.subprocess.Process, config: str, limit: int) -> tuple:
+        """
+        Helper Function for Bounded Output.
+        Feeds the config and reads the output, keeping the first `limit` bytes; past that only the
+        last chunk is kept, since curl's error message comes at the very end.
+        """
+        try:
+            worker.stdin.write(config.encode())
+            await worker.stdin.drain()
+            worker.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # curl exited early; its output says why
+        head = bytearray()
+        tail = b""
+        while chunk := await worker.stdout.read(STREAM_CHUNK_SIZE):
+            room = limit - len(head)
+            if room > 0:
+                head += chunk[:room]
+                chunk = chunk[room:]
+            if chunk:
+                tail = (tail + chunk)[-STREAM_CHUNK_SIZE:]
+        await worker.wait()
+        return bytes(head), tail
+
+    async def run(self, config: str, timeout: float, limit: int) -> tuple:
+        """
+        Run one request described by `config`, with stderr merged into the output.
+        Returns (returncode, output, tail): output is at most `limit` bytes, and tail holds the end
+        of anything past that (empty when nothing was cut).
+        """
+        worker = await self._acquire()
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill())
+        try:
+            output, tail = await asyncio.wait_for(self._exchange(worker, config, limit), timeout=timeout)
+        except asyncio.TimeoutError:
+            worker.kill()
+            await worker.wait()
+            raise
+        return worker.returncode, output, tail
+
+
+_CURL_POOL = CurlWorkerPool()
+
+
+async def execute_curl_subprocess(options: dict, url: str) -> dict:
+    """Execute the curl binary with the parsed options and return structured result."""
     result_info = {
         "output": "",
         "error": None,
         "return_code": None
     }
     try:
-        # Build command list using the helper
-        curl_command_list = build_curl_command_list(options, url)
-
-        # Execute the command
-        process = subprocess.run(
-            curl_command_list,
-            capture_output=True,
-            text=True,
-            check=False,  # Don't raise exception on non-zero exit code
-            timeout=int(options.get("-m", 30)) + 5  # Set a process timeout slightly larger than curl's -m
+        # Render the options as a curl config and hand it to a pre-started worker (stderr merged into stdout)
+        curl_config = build_curl_config(options, url)
+        max_time = int(options.get("-m", 30))
+        returncode, stdout, tail = await _CURL_POOL.run(
+            curl_config,
+            # Set a process timeout slightly larger than curl's -m (0 means curl has no limit)
+            timeout=max_time + 5 if max_time else None,
+            limit=MAX_OUTPUT_BYTES
         )
 
-        result_info["return_code"] = process.returncode
-        result_info["output"] = process.stdout
+        # Output stays bytes until it is turned into the text result, so binary bodies never fail to decode
+        result_info["return_code"] = returncode
+        result_info["output"] = stdout.decode('utf-8', errors='replace')
+        if tail:
+            result_info["output"] += f"\n--- Info ---\nOutput truncated at {MAX_OUTPUT_BYTES} bytes (use 'save' to write the full response to a file)"
+        if "-o" in options and returncode == 0:
+            # On its own line: -v traces and the truncation notice can precede it
+            if result_info["output"] and not result_info["output"].endswith("\n"):
+                result_info["output"] += "\n"
+            result_info["output"] += f"Saved to {options['-o']}"
 
         # Handle errors - check return code first
-        if process.returncode != 0:
-            # Prepend stderr to stdout if there's an error message
-            error_output = process.stderr.strip()
+        if returncode != 0:
+            # stderr is merged into the output; curl's own error message is the last line
+            error_output = (tail or stdout).decode('utf-8', errors='replace').strip().rsplit("\n", 1)[-1]
             if error_output:
                 # Try to give a more specific error if possible
                 if "Could not resolve host" in error_output:
@@ -417,27 +1056,22 @@ def execute_curl(options: dict, url: str) -> dict:
                 elif "timed out" in error_output:
                     result_info["error"] = "Timeout Error: The connection timed out."
                 else:
-                    result_info["error"] = f"Curl Error (Exit Code {process.returncode}): {error_output}"
-                # Append stderr to the main output for context
-                result_info["output"] += f"\n--- STDERR ---\n{error_output}"
+                    result_info["error"] = f"Curl Error (Exit Code {returncode}): {error_output}"
             else:
-                result_info["error"] = f"Curl failed with exit code {process.returncode} (no stderr message)."
+                result_info["error"] = f"Curl failed with exit code {returncode} (no stderr message)."
 
         # Specific handling for HEAD (-I) redirects (informational, not an error)
         elif "-I" in options and not options.get("-L", False):  # If -I used and -L not explicitly requested
-            if any(f"HTTP/{v} 30" in process.stdout for v in ["1.0", "1.1", "2"]):  # Check for 30x status codes
-                location = None
-                for line in process.stdout.splitlines():
-                    if line.lower().startswith("location:"):
-                        location = line.split(":", 1)[1].strip()
-                        break
+            if stdout and _RE_REDIRECT_STATUS.search(stdout):  # Check for 30x status codes
+                location_match = _RE_LOCATION.search(stdout)
+                location = location_match.group(1).decode('utf-8', errors='replace') if location_match else None
                 if location:
                     # Append info message to the output, don't set as error
                     result_info["output"] += f"\n--- Info ---\nRedirect detected to: {location}\n(Use '-L' or 'follow redirects' to follow)"
 
         return result_info
 
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         result_info["error"] = "Process Timeout: The curl command took too long to execute (exceeded timeout)."
         result_info["return_code"] = -1  # Indicate timeout
         return result_info
@@ -447,12 +1081,134 @@ def execute_curl(options: dict, url: str) -> dict:
         return result_info
     except Exception as e:
         # Catch other potential errors during execution (e.g., invalid arguments passed somehow)
-        print(f"Error executing curl command: {curl_command_list}\n{type(e).__name__}: {e}")
+        # Log the displayed form of the command: the raw config carries -u credentials
+        logger.exception("Error executing curl command: %s", shlex.join(iter_curl_args(options, url, DISPLAY_MASKS)))
         result_info["error"] = f"Internal error during execution: {str(e)}"
         result_info["return_code"] = -1
         return result_info
 
 
+# Capacity of each SSE connection's response queue (must be a power of two)
+SSE_QUEUE_CAPACITY = 256
+# Most queued responses written to an SSE stream in one send
+SSE_BATCH_MAX = 64
+
+
+class RingQueue:
+    """
+    Bounded single-consumer queue for SSE responses.
+    A fixed power-of-two ring buffer indexed by masked counters, with an Event each
+    for "has items" and "has room", so steady-state puts and gets allocate nothing.
+    Raises asyncio.QueueFull / asyncio.QueueEmpty like asyncio.Queue.
+    """
+    __slots__ = ("_buffer", "_mask", "_read", "_write", "_readable", "_writable", "__weakref__")
+
+    def __init__(self, capacity: int = SSE_QUEUE_CAPACITY):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("RingQueue capacity must be a power of two")
+        self._buffer = [None] * capacity
+        self._mask = capacity - 1
+        self._read = self._write = 0
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+
+    def qsize(self) -> int:
+        return self._write - self._read
+
+    def full(self) -> bool:
+        return self._write - self._read > self._mask
+
+    def put_nowait(self, item):
+        if self._write - self._read > self._mask:
+            raise asyncio.QueueFull
+        self._buffer[self._write & self._mask] = item
+        self._write += 1
+        self._readable.set()
+        if self._write - self._read > self._mask:
+            self._writable.clear()
+
+    async def put(self, item):
+        while self._write - self._read > self._mask:
+            await self._writable.wait()
+        self.put_nowait(item)
+
+    def get_nowait(self):
+        if self._read == self._write:
+            raise asyncio.QueueEmpty
+        index = self._read & self._mask
+        item = self._buffer[index]
+        self._buffer[index] = None  # Don't keep delivered payloads alive
+        self._read += 1
+        if self._read == self._write:
+            self._readable.clear()
+        self._writable.set()
+        return item
+
+    async def get(self):
+        while self._read == self._write:
+            await self._readable.wait()
+        return self.get_nowait()
+
+    async def get_batch(self, limit: int) -> list:
+        """Waits for at least one item, then takes everything queued up to limit in one go."""
+        while self._read == self._write:
+            await self._readable.wait()
+        end = self._read + min(self._write - self._read, limit)
+        items = []
+        for position in range(self._read, end):
+            index = position & self._mask
+            items.append(self._buffer[index])
+            self._buffer[index] = None
+        self._read = end
+        if self._read == self._write:
+            self._readable.clear()
+        self._writable.set()
+        return items
+
+
+# Constant HTTP bodies for the JSON-RPC endpoint, serialized once
+_ACK_BODY = orjson.dumps({"status": "accepted"})
+_ERROR_BODY = orjson.dumps({"status": "error"})
+_OVERSIZE_BODY = orjson.dumps({"status": "error", "message": "Request body too large"})
+# JSON-RPC frames are small; larger request bodies are rejected before parsing
+MAX_RPC_BODY_BYTES = 1024 * 1024
+# /info body split around its only dynamic field, the connection count
+_INFO_BODY_PREFIX = orjson.dumps({"server": "curl-mcp", "version": "1.0.0", "available_tools": ["curl"]})[:-1] + b',"active_connections":'
+_INFO_BODY_SUFFIX = b"}"
+
+# Static JSON-RPC results for the SSE server; only the message id changes per request
+_INITIALIZE_RESULT = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "tools": {}
+    },
+    "serverInfo": {
+        "name": "curl-mcp",
+        "version": "1.0.0"
+    }
+}
+
+_TOOLS_LIST_RESULT = {
+    "tools": [
+        {
+            "name": "curl",
+            "description": "Execute a curl command based on natural language instructions.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "instruction": {
+                        "type": "string",
+                        "description": "A natural language description of the curl request to make."
+                    }
+                },
+                "required": ["instruction"]
+            }
+        }
+    ]
+}
+
+
 async def create_sse_server(host: str, port: int):
     """Create SSE server following MCP SSE specification."""
     if not SSE_AVAILABLE:
@@ -466,21 +1222,36 @@ async def create_sse_server(host: str, port: int):
     # Add request logging middleware
     class RequestLoggingMiddleware(BaseHTTPMiddleware):
         async def dispatch(self, request: Request, call_next):
-            logger.info(f"Request: {request.method} {request.url} from {request.client}")
-            logger.info(f"Headers: {dict(request.headers)}")
+            logger.info("Request: %s %s from %s", request.method, request.url, request.client)
+            if logger.isEnabledFor(logging.INFO):  # Skip copying the headers when INFO is filtered out
+                logger.info("Headers: %s", dict(request.headers))
             response = await call_next(request)
-            logger.info(f"Response: {response.status_code}")
+            logger.info("Response: %s", response.status_code)
             return response
 
     app.add_middleware(RequestLoggingMiddleware)
-    # Store response queues for active SSE connections
-    response_queues = {}
+
+    class ORJSONResponse(Response):
+        """JSON response whose content is serialized with orjson; pre-serialized bytes are sent as-is."""
+        media_type = "application/json"
+
+        def render(self, content) -> bytes:
+            return content if isinstance(content, bytes) else orjson.dumps(content)
+
+    # Constant responses are built once; their encoded headers are reused on every send
+    ack_response = ORJSONResponse(_ACK_BODY)
+    error_response_500 = ORJSONResponse(_ERROR_BODY, status_code=500)
+    oversize_response = ORJSONResponse(_OVERSIZE_BODY, status_code=413)
+    # Response queues for active SSE connections; weak values so a connection's queue can never outlive its request
+    response_queues = weakref.WeakValueDictionary()
 
     async def sse_endpoint(request):
         """SSE endpoint that sends the JSON-RPC endpoint URL and handles responses."""
-        logger.info(f"New SSE connection from {request.client}")
+        logger.info("New SSE connection from %s", request.client)
         connection_id = id(request)
-        response_queue = asyncio.Queue()
+        response_queue = RingQueue()
+        # The request holds the strong reference for the lifetime of the connection
+        request.state.response_queue = response_queue
         response_queues[connection_id] = response_queue
 
         async def event_generator():
@@ -499,7 +1270,7 @@ async def create_sse_server(host: str, port: int):
                     # Use the configured host
                     endpoint_url = f"http://{host}:{port}/mcp"
 
-                logger.info(f"Sending endpoint URL: {endpoint_url}")
+                logger.info("Sending endpoint URL: %s", endpoint_url)
                 yield {
                     "event": "endpoint",
                     "data": endpoint_url
@@ -507,86 +1278,92 @@ async def create_sse_server(host: str, port: int):
 
                 # Listen for responses to send back
                 while True:
-                    try:
-                        # Wait for response without timeout (blocking)
-                        response = await response_queue.get()
-                        yield {
-                            "event": "message",
-                            "data": json.dumps(response)
-                        }
-                    except Exception:
-                        # Break on any error to close the connection
-                        break
-
+                    # Wait for response without timeout; a client disconnect cancels this
+                    # Queued responses are already-serialized JSON bytes; everything queued
+                    # at wake-up is framed here and sent as one write
+                    payloads = await response_queue.get_batch(SSE_BATCH_MAX)
+                    yield b"".join(b"event: message\r\ndata: " + payload + b"\r\n\r\n" for payload in payloads)
+
+            except asyncio.CancelledError:
+                logger.info("SSE connection %s closed", connection_id)
+                raise
             except Exception as e:
-                logger.error(f"SSE connection error: {e}")
+                logger.error("SSE connection error: %s", e)
             finally:
-                # Clean up connection
-                logger.info(f"Cleaning up SSE connection {connection_id}")
-                if connection_id in response_queues:
-                    del response_queues[connection_id]
+                # Drop the entry now rather than waiting for the cycle collector to free the request
+                response_queues.pop(connection_id, None)
 
         return EventSourceResponse(event_generator())
 
+    async def broadcast(message: dict):
+        """Push a JSON-RPC message to every active SSE connection; only full queues take the awaiting slow path."""
+        # Serialize once for all connections rather than once per connection
+        item = orjson.dumps(message)
+        slow_queues = None
+        # Snapshot the consumers so connects/disconnects during the awaits below don't affect iteration
+        for queue in tuple(response_queues.values()):
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                if slow_queues is None:
+                    slow_queues = []
+                slow_queues.append(queue)
+        if not slow_queues:
+            return
+
+        async def put_with_timeout(queue):
+            try:
+                await asyncio.wait_for(queue.put(item), timeout=1.0)
+            except asyncio.TimeoutError:
+                logger.warning("Response queue full, dropping response")
+
+        if len(slow_queues) == 1:
+            await put_with_timeout(slow_queues[0])
+        else:
+            await asyncio.gather(*(put_with_timeout(queue) for queue in slow_queues))
+
+    async def read_body_limited(request):
+        """Read the request body, or return None as soon as it exceeds MAX_RPC_BODY_BYTES."""
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_RPC_BODY_BYTES:
+            return None
+        chunks = []
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > MAX_RPC_BODY_BYTES:
+                return None
+            chunks.append(chunk)
+        return b"".join(chunks)
+
     # JSON-RPC endpoint for handling MCP requests
     async def mcp_rpc_endpoint(request):
         """Handle JSON-RPC requests and send responses via SSE."""
         try:
-            body = await request.json()
-            logger.debug(f"Received JSON-RPC request: {body}")
+            raw_body = await read_body_limited(request)
+            if raw_body is None:
+                logger.warning("Rejected JSON-RPC request body over %s bytes", MAX_RPC_BODY_BYTES)
+                return oversize_response
+            # orjson parses the bytes directly, without a str decode
+            body = orjson.loads(raw_body)
+            logger.debug("Received JSON-RPC request: %s", body)
 
             # Handle different MCP methods
             response = None
+            method = body.get("method")
             message_id = body.get("id")  # Can be None for notifications
 
-            if body.get("method") == "initialize":
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": message_id,
-                    "result": {
-                        "protocolVersion": "2024-11-05",
-                        "capabilities": {
-                            "tools": {}
-                        },
-                        "serverInfo": {
-                            "name": "curl-mcp",
-                            "version": "1.0.0"
-                        }
-                    }
-                }
-            elif body.get("method") == "notifications/initialized":
+            if method == "notifications/initialized":
                 # This is a notification, no response needed
                 logger.info("Received initialized notification")
-                return Response(
-                    json.dumps({"status": "accepted"}),
-                    media_type="application/json"
-                )
-            elif body.get("method") == "tools/list":
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": message_id,
-                    "result": {
-                        "tools": [
-                            {
-                                "name": "curl",
-                                "description": "Execute a curl command based on natural language instructions.",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "instruction": {
-                                            "type": "string",
-                                            "description": "A natural language description of the curl request to make."
-                                        }
-                                    },
-                                    "required": ["instruction"]
-                                }
-                            }
-                        ]
-                    }
-                }
-            elif body.get("method") == "tools/call":
+                return ack_response
+            elif method == "initialize":
+                response = {"jsonrpc": "2.0", "id": message_id, "result": _INITIALIZE_RESULT}
+            elif method == "tools/list":
+                response = {"jsonrpc": "2.0", "id": message_id, "result": _TOOLS_LIST_RESULT}
+            elif method == "tools/call":
                 params = body.get("params", {})
-                logger.info(f"Tool call params: {params}")
+                logger.info("Tool call params: %s", params)
 
                 if params.get("name") == "curl":
                     instruction = params.get("arguments", {}).get("instruction", "")
@@ -623,44 +1400,32 @@ async def create_sse_server(host: str, port: int):
                             "message": f"Unknown tool: {params.get('name')}"
                         }
                     }
+            elif message_id is None:
+                # For unknown notifications, just acknowledge; no error is sent for them
+                logger.warning("Unknown notification method: %s", method)
+                return ack_response
             else:
-                # Only send error responses for requests (with id), not notifications
-                if message_id is not None:
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": message_id,
-                        "error": {
-                            "code": -32601,
-                            "message": f"Method not found: {body.get('method')}"
-                        }
+                response = {
+                    "jsonrpc": "2.0",
+                    "id": message_id,
+                    "error": {
+                        "code": -32601,
+                        "message": f"Method not found: {method}"
                     }
-                else:
-                    # For unknown notifications, just acknowledge
-                    logger.warning(f"Unknown notification method: {body.get('method')}")
-                    return Response(
-                        json.dumps({"status": "accepted"}),
-                        media_type="application/json"
-                    )
+                }
 
             # Only send response via SSE if we have a response (i.e., for requests, not notifications)
             if response:
-                logger.debug(f"Sending JSON-RPC response: {response}")
+                logger.debug("Sending JSON-RPC response: %s", response)
 
                 # Send response to all active SSE connections
-                for queue in response_queues.values():
-                    try:
-                        queue.put_nowait(response)
-                    except asyncio.QueueFull:
-                        logger.warning("Response queue full, dropping response")
+                await broadcast(response)
 
             # Return simple HTTP acknowledgment
-            return Response(
-                json.dumps({"status": "accepted"}),
-                media_type="application/json"
-            )
+            return ack_response
 
         except Exception as e:
-            logger.error(f"Error in MCP RPC endpoint: {e}")
+            logger.error("Error in MCP RPC endpoint: %s", e)
             error_response = {
                 "jsonrpc": "2.0",
                 "id": body.get("id") if 'body' in locals() else None,
@@ -671,17 +1436,9 @@ async def create_sse_server(host: str, port: int):
             }
 
             # Send error to all active SSE connections
-            for queue in response_queues.values():
-                try:
-                    queue.put_nowait(error_response)
-                except asyncio.QueueFull:
-                    logger.warning("Response queue full, dropping error response")
-
-            return Response(
-                json.dumps({"status": "error"}),
-                media_type="application/json",
-                status_code=500
-            )
+            await broadcast(error_response)
+
+            return error_response_500
 
     # Mount SSE endpoint at root for MCP compatibility
     app.add_route("/", sse_endpoint)
@@ -689,15 +1446,7 @@ async def create_sse_server(host: str, port: int):
 
     # Add a simple info endpoint for debugging
     async def info_endpoint(request):
-        return Response(
-            json.dumps({
-                "server": "curl-mcp",
-                "version": "1.0.0",
-                "available_tools": ["curl"],
-                "active_connections": len(response_queues)
-            }),
-            media_type="application/json"
-        )
+        return ORJSONResponse(b"".join((_INFO_BODY_PREFIX, str(len(response_queues)).encode(), _INFO_BODY_SUFFIX)))
 
     app.add_route("/info", info_endpoint)
 
@@ -706,11 +1455,47 @@ async def create_sse_server(host: str, port: int):
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully."""
-    logger.info(f"Received signal {signum}, shutting down...")
+    logger.info("Received signal %s, shutting down...", signum)
+    # os._exit skips atexit, so flush queued log records first
+    if log_listener is not None:
+        log_listener.stop()
     # Force exit immediately
     os._exit(0)
 
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def setup_logging(log_file: str = None) -> logging.handlers.QueueListener:
+    """
+    Helper Function for Logging Setup.
+    Configures logging once: the root logger only enqueues records, and a background
+    QueueListener does the formatting and the file/console write, so request handlers
+    never block on log I/O. Console mode keeps any handlers already installed on the root
+    logger (FastMCP installs one at import). Call after daemonizing, since the listener
+    thread does not survive fork.
+    """
+    global log_listener
+    root = logging.getLogger()
+    if log_file:
+        handlers = [logging.FileHandler(log_file, mode='a')]
+    else:
+        handlers = root.handlers[:] or [logging.StreamHandler()]
+    for handler in handlers:
+        if handler.formatter is None:
+            handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    log_queue = SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+    log_listener.start()
+    # Flush whatever is still queued on exit
+    atexit.register(log_listener.stop)
+    return log_listener
+
+
 def daemonize():
     """Daemonize the current process."""
     try:
@@ -720,7 +1505,7 @@ def daemonize():
             # Parent process, exit
             sys.exit(0)
     except OSError as e:
-        logger.error(f"First fork failed: {e}")
+        logger.error("First fork failed: %s", e)
         sys.exit(1)
 
     # Decouple from parent environment
@@ -735,7 +1520,7 @@ def daemonize():
             # Parent process, exit
             sys.exit(0)
     except OSError as e:
-        logger.error(f"Second fork failed: {e}")
+        logger.error("Second fork failed: %s", e)
         sys.exit(1)
 
     # Redirect standard file descriptors
@@ -780,38 +1565,21 @@ def main_sync():
         print("Stdio mode requires interactive I/O and cannot be daemonized.")
         sys.exit(1)
 
-    # Set up logging
+    # Set up logging; daemon mode forks first so the file handle and listener thread belong to the daemon
     if args.sse and args.daemon:
+        daemonize()
         # File logging for SSE daemon mode
-        log_file = "/tmp/curl-mcp.log"
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            filename=log_file,
-            filemode='a'
-        )
+        setup_logging("/tmp/curl-mcp.log")
+        logger.info("Daemonized SSE server process (pid %s)", os.getpid())
     else:
         # Console logging for all other modes
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-
-    # Daemonize only for SSE daemon mode
-    if args.sse and args.daemon:
-        logger.info("Daemonizing SSE server process...")
-        daemonize()
-        # Re-setup logging after daemonization since file descriptors changed
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            filename=log_file,
-            filemode='a',
-            force=True  # Force reconfiguration
-        )
+        setup_logging()
 
-    # Now run the async main function
-    asyncio.run(main_async(args))
+    # Now run the async main function; the SSE server runs on uvloop when it is installed
+    if args.sse and UVLOOP_AVAILABLE:
+        uvloop.run(main_async(args))
+    else:
+        asyncio.run(main_async(args))
 
 
 async def main_async(args):
@@ -828,9 +1596,9 @@ async def main_async(args):
             sys.exit(1)
 
         if args.daemon:
-            logger.info(f"Starting Curl MCP Server in SSE daemon mode on {args.host}:{args.port}")
+            logger.info("Starting Curl MCP Server in SSE daemon mode on %s:%s", args.host, args.port)
         else:
-            logger.info(f"Starting Curl MCP Server in SSE mode on {args.host}:{args.port}")
+            logger.info("Starting Curl MCP Server in SSE mode on %s:%s", args.host, args.port)
 
         app = await create_sse_server(args.host, args.port)
 